@@ -23,102 +23,226 @@ Escaping:
 
 __version__ = "2023.10.1"
 
+import functools
 import itertools
 import re
+from dataclasses import dataclass
+from types import MappingProxyType
 from types import SimpleNamespace
+from typing import Any
 from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Optional
 
-from qre.registered_types import register_type
+from qre.registered_types import register_type as _register_type
 from qre.registered_types import registered_types
 
-__all__ = ["register_type", "Matcher", "match", "match_start", "match_end", "search", "search_all"]
+__all__ = [
+    "register_type", "clear_cache", "Matcher", "match", "match_start", "match_end", "search", "search_all"
+]
 
 
 # taken from the stdlib re module - minus "*+?[]", because that's our own syntax
 SPECIAL_CHARS = {character: "\\" + chr(character) for character in b"(){}-^$\\.&~# \t\n\r\v\f"}
-
-
-def qre(*patterns, case_sensitive: bool = True, flexible_spaces: bool = True, strict: bool = False):
+SPECIAL_CHARS_SET = frozenset(chr(character) for character in SPECIAL_CHARS)
+SPECIAL_CHARS_FLEXIBLE_SPACES = {**SPECIAL_CHARS, ord(" "): r"\ +"}
+
+WILDCARDS = {
+    "*": r".*",
+    "+": r".",
+    "?": r".?",
+    "|": r"|",  # Not converted but can be escaped
+}
+ESCAPED_WILDCARDS = {f"[{wildcard}]": "\\" + wildcard for wildcard in WILDCARDS}
+
+# A single replacement argument of these types is taken as the list of replacement values
+SEQUENCE_TYPES = (list, tuple)
+
+# Patterns without any of these are plain strings, apart from spaces when flexible_spaces is on
+PATTERN_SYNTAX = frozenset("*+?|[]")
+
+# Tokens of a pattern, in order of precedence: literal brackets, groups, wildcards, spaces, plain text, lone brackets
+TOKEN_RE = re.compile(
+    r"(?P<brackets>\[\[|]])|(?P<group>\[[^\]]*])|(?P<wildcard>[*+?|])|(?P<space> )"
+    r"|(?P<text>[^\[\]*+?| ]+)|(?P<bracket>[\[\]])"
+)
+# Literal brackets, and brackets that are not part of a group
+BRACKETS = {"[[": r"\[", "]]": r"\]", "[": r"\[", "]": "]"}
+
+# All the group syntaxes: [], [:4], [:int], [name], [name:4], [name:int]
+FIELD_RE = re.compile(r"\[(?P<name>\w+)?(?::(?:(?P<width>\d+)|(?P<type>\w+)))?]")
+
+
+def qre(
+    *patterns, case_sensitive: bool = True, flexible_spaces: bool = True, strict: bool = False, engine: str = "re"
+):
     if not patterns:
         return ValueError("Must provide at least one pattern")
     elif len(patterns) == 1:
-        return Matcher(patterns[0], case_sensitive=case_sensitive, flexible_spaces=flexible_spaces)
+        return Matcher(patterns[0], case_sensitive=case_sensitive, flexible_spaces=flexible_spaces, engine=engine)
     else:
-        return MultiMatcher(patterns, case_sensitive=case_sensitive, flexible_spaces=flexible_spaces, strict=strict)
+        return MultiMatcher(
+            patterns, case_sensitive=case_sensitive, flexible_spaces=flexible_spaces, strict=strict, engine=engine
+        )
+
+
+# Regex features that RE2 does not support: lookarounds and backreferences
+RE2_UNSUPPORTED = re.compile(r"\(\?<?[=!]|\(\?P=|\\[1-9Z]")
+
+
+def _engine_module(engine: str, regex: str = ""):
+    if engine == "re":
+        return re
+    elif engine == "re2":
+        try:
+            import re2
+        except ImportError:
+            raise ImportError("engine='re2' requires the google-re2 package: pip install qre[re2]") from None
+        return re2
+    elif engine == "auto":
+        if RE2_UNSUPPORTED.search(regex):
+            return re
+        try:
+            import re2
+        except ImportError:
+            return re
+        return re2
+    else:
+        raise ValueError(f"Unknown engine {engine} - known engines are: re,re2,auto")
+
+
+def _compile(engine_module, regex: str, case_sensitive: bool):
+    if engine_module is re:
+        return re.compile(regex, 0 if case_sensitive else re.IGNORECASE)
+    # RE2 takes an options object instead of flags. With "auto", a pattern RE2 rejects falls back to re, so RE2 must
+    # not log the error to stderr.
+    options = engine_module.Options()
+    options.case_sensitive = case_sensitive
+    options.log_errors = False
+    return engine_module.compile(regex, options)
+
+
+def _compile_with_end(engine: str, regex: str, case_sensitive: bool):
+    """ Compile the regex as is and anchored to the end of the string, falling back to re with "auto". """
+    engine_module = _engine_module(engine, regex)
+    try:
+        return (
+            _compile(engine_module, regex, case_sensitive),
+            _compile(engine_module, f"{regex}$", case_sensitive),
+        )
+    except engine_module.error:
+        if engine != "auto" or engine_module is re:
+            raise
+        return _compile_with_end("re", regex, case_sensitive)
 
 
 class MatchResult(dict):
 
+    __slots__ = ("unnamed", "_matches")  # Results are created for every match, so no per-instance __dict__
+
     unnamed: list
     _matches: list[re.Match]
 
     def __bool__(self):
         return bool(self._matches)
 
-    def all_values(self) -> Iterable:
-        return itertools.chain(self.unnamed, self.values())
+    @classmethod
+    def _no_match(cls):
+        result = cls()
+        result.unnamed = []
+        result._matches = []
+        return result
 
-    def all_items(self) -> Iterable[tuple]:
-        return itertools.chain(((None, value) for value in self.unnamed), self.items())
+    def all_values(self) -> list:
+        """
+        Return a list of all matched values, unnamed first.
+        """
+        return [*self.unnamed, *self.values()]
+
+    def all_items(self) -> list[tuple]:
+        """
+        Return a list of all key/value combos, unnamed first. Key for the unnamed groups is None.
+        """
+        return [*((None, value) for value in self.unnamed), *self.items()]
 
     def as_object(self):
         return MatchObject(**self, unnamed=self.unnamed, _matches=self._matches)
 
-    def replace(self, *with_values):
+    def replace(self, *with_values) -> str:
         """
         Replace matched groups, in order, with the given values.
 
         Unnamed and named groups are treated identically here.
         """
+        spans = self._replacement_spans(with_values)
+        return self._string_with_replacements(self._matches[0].string, spans)
+
+    def replace_into(self, buffer, *with_values):
+        """
+        Like replace(), but writes the resulting string into a buffer like io.StringIO instead of returning it.
+
+        Avoids building intermediate strings when replacing in large strings or chaining replacements.
+        """
+        spans = self._replacement_spans(with_values)
+        buffer.writelines(self._pieces_with_replacements(self._matches[0].string, spans))
+
+    def _replacement_spans(self, with_values) -> list:
         if not with_values:
             raise ValueError("Provide one or many strings, a list or a dict of replacement values")
         if not self:
             raise ValueError("replace() can only be used on successful match")
-        original_string = self._matches[0].string  # All matches have the same matched string
 
         if len(with_values) == 1:
-            if type(with_values[0]) in (tuple, list):
+            if isinstance(with_values[0], SEQUENCE_TYPES):
                 with_values = with_values[0]
 
             elif isinstance(with_values[0], dict):
                 replacement_values = with_values[0]
                 spans = []
-                for name in replacement_values:
-                    for match in self._matches:
-                        try:
-                            if match.start(name) != -1:
-                                spans.append((*match.span(name), replacement_values[name]))
-                        except IndexError:  # Expected: Not all sub-matches have all replacement groups
-                            pass
+                for match in self._matches:
+                    group_index = match.re.groupindex  # Resolve names to group numbers once per match
+                    group_count = match.re.groups
+                    for name, replacement_value in replacement_values.items():
+                        # Group numbers can be used as keys too
+                        if isinstance(name, int):
+                            index = name if 0 <= name <= group_count else None
+                        else:
+                            index = group_index.get(name)
+                        # Expected: Not all sub-matches have all replacement groups
+                        if index is not None and match.start(index) != -1:
+                            spans.append((*match.span(index), replacement_value))
                 spans.sort()
-                return self._string_with_replacements(original_string, spans)
+                return spans
 
-        if type(with_values) in (tuple, list):
-            return self._replace_as_long_as_values_last(original_string, iter(with_values))
+        return self._spans_as_long_as_values_last(iter(with_values))
 
-    def _replace_as_long_as_values_last(self, original_string, values):
+    def _spans_as_long_as_values_last(self, values) -> list:
         # Replace all types of groups in order
         # For multi-matches, order of sub-patterns is expected to match the replacement value order
         spans = []
         try:
             for match in self._matches:
-                for i in range(match.lastindex):
-                    spans.append((*match.span(i + 1), next(values)))
+                for i in range(1, match.re.groups + 1):
+                    if match.start(i) != -1:  # Groups in a non-matching alternative are skipped
+                        spans.append((*match.span(i), next(values)))
         except StopIteration:
             pass
         spans.sort()
-        return self._string_with_replacements(original_string, spans)
+        return spans
 
     @staticmethod
-    def _string_with_replacements(original_string, spans):
-        result_string = ""
+    def _pieces_with_replacements(original_string, spans) -> Iterable[str]:
         previous_end = 0
         for start, end, replacement_value in spans:
-            result_string += f"{original_string[previous_end:start]}{replacement_value}"
+            yield original_string[previous_end:start]
+            yield str(replacement_value)
             previous_end = end
-        result_string += original_string[previous_end:]
-        return result_string
+        yield original_string[previous_end:]
+
+    @staticmethod
+    def _string_with_replacements(original_string, spans) -> str:
+        return "".join(MatchResult._pieces_with_replacements(original_string, spans))
 
 
 class MatchResultList(list):
@@ -126,13 +250,13 @@ class MatchResultList(list):
         """
         Return all matched values over all results.
         """
-        return itertools.chain(result.all_values() for result in self)
+        return itertools.chain.from_iterable(result.all_values() for result in self)
 
     def all_items(self) -> Iterable[tuple]:
         """
         Return all key/value combos of all results. Key for the unnamed groups is None.
         """
-        return itertools.chain(result.all_items() for result in self)
+        return itertools.chain.from_iterable(result.all_items() for result in self)
 
     def replace(self, *with_values):
         """
@@ -144,7 +268,7 @@ class MatchResultList(list):
         if not self:
             raise ValueError("replace() can only be used on successful match")
         if len(with_values) == 1:
-            if type(with_values[0]) in (tuple, list):
+            if isinstance(with_values[0], SEQUENCE_TYPES):
                 with_values = with_values[0]
         if not with_values:
             raise ValueError("Provide one or many values, or a single list of replacement values")
@@ -152,10 +276,13 @@ class MatchResultList(list):
         string = self[0]._matches[0].string  # All matches have the same matched string
         replacement_values = iter(with_values)
 
+        # Spans of all results refer to the original string, so they are applied in one go
+        spans = []
         for result in self:
-            string = result._replace_as_long_as_values_last(string, replacement_values)
+            spans.extend(result._spans_as_long_as_values_last(replacement_values))
+        spans.sort()  # MultiMatcher results are in pattern order, not in string order
 
-        return string
+        return MatchResult._string_with_replacements(string, spans)
 
 
 class MatchObject(SimpleNamespace):
@@ -164,13 +291,241 @@ class MatchObject(SimpleNamespace):
         return bool(self._matches)
 
 
-class Matcher:
-    def __init__(self, pattern: str = "*", case_sensitive: bool = True, flexible_spaces=True):
-        self.converters = {}
-        self._regex = None
+class _PatternBuilder:
+    """ Translates a qre pattern into a regex and collects the converters of its typed groups. """
+
+    def __init__(self, pattern: str, flexible_spaces: bool = True):
         self.pattern = pattern
-        self.case_sensitive = case_sensitive
         self.flexible_spaces = flexible_spaces
+        self.unnamed_converters = []  # (index, converter) pairs
+        self.named_converters = []  # (name, converter) pairs
+        self.group_names = []  # Names of the named groups, in order
+        self._unnamed_group_index = 0
+        self._literal_runs = []  # Runs of plain characters that every match must contain
+        self.has_alternatives = False  # A top-level |, so groups of the other alternatives may not participate
+        self.regex = self._create_regex()
+
+    @property
+    def starts_with_literal(self) -> bool:
+        return bool(self._literal_runs and self._literal_runs[0])
+
+    @property
+    def required_literal(self) -> str:
+        """ Longest plain substring that any matching string contains, or "" if there is none. """
+        if self.has_alternatives or not self._literal_runs:
+            return ""
+        return max(self._literal_runs, key=len)
+
+    def _create_regex(self):
+        pattern = self.pattern
+        if PATTERN_SYNTAX.isdisjoint(pattern):
+            # No wildcards or groups, only escaping is needed
+            self._literal_runs = pattern.split(" ") if self.flexible_spaces else [pattern]
+            return pattern.translate(SPECIAL_CHARS_FLEXIBLE_SPACES if self.flexible_spaces else SPECIAL_CHARS)
+
+        space = r"\ +" if self.flexible_spaces else r"\ "
+        # Spaces are handled separately, so most patterns need no escaping at all
+        needs_escaping = not SPECIAL_CHARS_SET.isdisjoint(pattern.replace(" ", ""))
+
+        # Single left-to-right scan over the pattern tokens
+        result = []
+        runs = self._literal_runs
+        run = ""  # Plain characters since the last wildcard or group
+        for token in TOKEN_RE.finditer(pattern):
+            kind = token.lastgroup
+            value = token.group()
+            if kind == "text":
+                result.append(value.translate(SPECIAL_CHARS) if needs_escaping else value)
+                run += value
+            elif kind == "space":
+                result.append(space)
+                if self.flexible_spaces:
+                    runs.append(run)
+                    run = ""
+                else:
+                    run += " "
+            elif kind == "group":
+                escaped_wildcard = ESCAPED_WILDCARDS.get(value)
+                if escaped_wildcard:
+                    result.append(escaped_wildcard)
+                    run += value[1]
+                else:
+                    result.append(self._field_repl(value))
+                    runs.append(run)
+                    run = ""
+            elif kind == "wildcard":
+                result.append(WILDCARDS[value])
+                runs.append(run)
+                run = ""
+                if value == "|":
+                    self.has_alternatives = True
+            else:
+                result.append(BRACKETS[value])
+                run += value[0]
+        runs.append(run)
+
+        return "".join(result)
+
+    def _field_repl(self, group_string):
+        match = FIELD_RE.fullmatch(group_string.replace(" ", "") if " " in group_string else group_string)
+        if not match:
+            raise ValueError(f"Invalid group {group_string}")
+        name, width, type_ = match.groups()
+
+        if name is None:
+            # unnamed field, remember the index for type conversion
+            index = self._unnamed_group_index
+            self._unnamed_group_index += 1
+
+            if width:
+                return fr"(.{{{width}}})"
+            elif type_:
+                type_spec = self._type_spec(type_)
+                # register this field with the index of the group to convert it later
+                self.unnamed_converters.append((index, type_spec.converter))
+                return type_spec.unnamed_group
+            else:
+                return r"(.*)"
+
+        self.group_names.append(name)
+        if width:
+            return fr"(?P<{name}>.{{{width}}})"
+        elif type_:
+            type_spec = self._type_spec(type_)
+            # register this field to convert it later
+            self.named_converters.append((name, type_spec.converter))
+            return type_spec.named_template.format(name=name)
+        else:
+            return fr"(?P<{name}>.*)"
+
+    @staticmethod
+    def _type_spec(type_):
+        try:
+            return registered_types[type_]
+        except KeyError:
+            raise ValueError(
+                f"Unknown type {type_} - known types are: {','.join(registered_types.keys()) or 'None found'}"
+            ) from None
+
+
+@dataclass(frozen=True)
+class _Translation:
+    """ A pattern translated into a regex, with what is needed to convert and prefilter its matches. """
+    regex: str
+    unnamed_converters: tuple  # (index, converter) pairs
+    named_converters: tuple  # (name, converter) pairs
+    required_literal: str
+    starts_with_literal: bool
+    has_alternatives: bool
+    group_names: tuple
+
+
+@functools.lru_cache(maxsize=2048)
+def _translate(pattern: str, flexible_spaces: bool) -> _Translation:
+    """ Cached translation of a pattern. """
+    builder = _PatternBuilder(pattern, flexible_spaces)
+    return _Translation(
+        regex=builder.regex,
+        unnamed_converters=tuple(builder.unnamed_converters),
+        named_converters=tuple(builder.named_converters),
+        required_literal=builder.required_literal,
+        starts_with_literal=builder.starts_with_literal,
+        has_alternatives=builder.has_alternatives,
+        group_names=tuple(builder.group_names),
+    )
+
+
+@dataclass(frozen=True)
+class _CompiledState:
+    """ The immutable state of a Matcher, shared by all Matchers with the same pattern and options. """
+    regex: str
+    unnamed_converters: tuple
+    named_converters: tuple
+    converters: MappingProxyType
+    compiled: Any
+    compiled_end: Any
+    has_groups: bool
+    unnamed_positions: tuple
+    named_always_participate: bool
+    literal: Optional[str]
+    required: Optional[str]
+    required_in_match: Optional[str]
+
+
+@functools.lru_cache(maxsize=1024)
+def _prepare(pattern: str, case_sensitive: bool, flexible_spaces: bool, engine: str) -> _CompiledState:
+    """ Cached compilation of a pattern with a set of options. """
+    translation = _translate(pattern, flexible_spaces)
+    compiled, compiled_end = _compile_with_end(engine, translation.regex, case_sensitive)
+    # Every named group takes part in a successful match, unless the pattern has alternatives or a registered
+    # type brings named groups of its own, so there are no Nones in groupdict() to leave out
+    named_always_participate = (
+        not translation.has_alternatives and compiled.groupindex.keys() == set(translation.group_names)
+    )
+    # Positions of the unnamed groups in match.groups()
+    named_positions = frozenset(number - 1 for number in compiled.groupindex.values())
+    unnamed_positions = tuple(position for position in range(compiled.groups) if position not in named_positions)
+
+    # Plain string patterns are looked for with str methods, the regex is only used to create the match
+    is_literal = (
+        pattern
+        and case_sensitive
+        and PATTERN_SYNTAX.isdisjoint(pattern)
+        and not (flexible_spaces and " " in pattern)
+    )
+    # Other patterns can still be rejected quickly when a substring they require is missing
+    required_literal = translation.required_literal
+    required = required_literal if required_literal and case_sensitive and not is_literal else None
+
+    return _CompiledState(
+        regex=translation.regex,
+        unnamed_converters=translation.unnamed_converters,
+        named_converters=translation.named_converters,
+        # Read-only, so that it can be shared by all Matchers with the same options
+        converters=MappingProxyType({**dict(translation.unnamed_converters), **dict(translation.named_converters)}),
+        compiled=compiled,
+        compiled_end=compiled_end,
+        # Without groups, results need no group collection or conversion at all
+        has_groups=compiled.groups > 0,
+        unnamed_positions=unnamed_positions,
+        named_always_participate=named_always_participate,
+        literal=pattern if is_literal else None,
+        required=required,
+        # Anchored matches with a literal start fail fast without scanning the whole string
+        required_in_match=None if translation.starts_with_literal else required,
+    )
+
+
+class Matcher:
+
+    __slots__ = (
+        "_pattern",
+        "_case_sensitive",
+        "_flexible_spaces",
+        "_engine",
+        "_regex",
+        "_unnamed_converters",
+        "_named_converters",
+        "_converters",
+        "_compiled",
+        "_compiled_end",
+        "_has_groups",
+        "_unnamed_positions",
+        "_named_always_participate",
+        "_literal",
+        "_required",
+        "_required_in_match",
+        "_compiled_fullmatch",
+        "_compiled_match",
+        "_compiled_search",
+    )
+
+    def __init__(self, pattern: str = "*", case_sensitive: bool = True, flexible_spaces=True, engine: str = "re"):
+        """
+        engine: "re" for the standard library, or "re2" for linear-time matching with the optional google-re2 package.
+            "auto" uses RE2 when it is installed and supports the pattern, and the standard library otherwise.
+        """
+        self._build(pattern, case_sensitive, flexible_spaces, engine)
 
     @property
     def pattern(self):
@@ -178,220 +533,282 @@ class Matcher:
 
     @pattern.setter
     def pattern(self, value):
-        self._pattern = value
-        self._regex = None
+        self._build(value, self.case_sensitive, self.flexible_spaces, self.engine)
+
+    @property
+    def case_sensitive(self):
+        return self._case_sensitive
+
+    @case_sensitive.setter
+    def case_sensitive(self, value):
+        self._build(self.pattern, value, self.flexible_spaces, self.engine)
+
+    @property
+    def flexible_spaces(self):
+        return self._flexible_spaces
+
+    @flexible_spaces.setter
+    def flexible_spaces(self, value):
+        self._build(self.pattern, self.case_sensitive, value, self.engine)
+
+    @property
+    def engine(self):
+        return self._engine
+
+    @engine.setter
+    def engine(self, value):
+        self._build(self.pattern, self.case_sensitive, self.flexible_spaces, value)
 
     @property
     def regex(self):
-        if self._regex is None:
-            self._regex = self._create_regex()
         return self._regex
 
-    def _compile(self, pattern):
-        return re.compile(pattern, flags=0 if self.case_sensitive else re.IGNORECASE)
+    @property
+    def converters(self) -> MappingProxyType:
+        """ Converters in use, keyed by group name for named groups and by index for unnamed groups. Read-only. """
+        return self._converters
+
+    def _build(self, pattern: str, case_sensitive: bool, flexible_spaces: bool, engine: str):
+        """ Set up the regexes and the matching shortcuts, shared by all Matchers with the same options. """
+        # Prepared first, so that invalid options leave the Matcher as it was
+        state = _prepare(pattern, case_sensitive, flexible_spaces, engine)
+        self._pattern = pattern
+        self._case_sensitive = case_sensitive
+        self._flexible_spaces = flexible_spaces
+        self._engine = engine
+        # Copied to slots, as the matching methods read them on every call
+        self._regex = state.regex
+        self._unnamed_converters = state.unnamed_converters
+        self._named_converters = state.named_converters
+        self._converters = state.converters
+        self._compiled = state.compiled
+        self._compiled_end = state.compiled_end
+        self._has_groups = state.has_groups
+        self._unnamed_positions = state.unnamed_positions
+        self._named_always_participate = state.named_always_participate
+        self._literal = state.literal
+        self._required = state.required
+        self._required_in_match = state.required_in_match
+        # Bound once, as these are called on every match
+        self._compiled_fullmatch = self._compiled.fullmatch
+        self._compiled_match = self._compiled.match
+        self._compiled_search = self._compiled.search
 
     def match(self, string: str) -> MatchResult:
-        return self._create_result(self._compile(self.regex).fullmatch(string))
+        return self._create_result(self._match(string))
 
     def match_start(self, string: str) -> MatchResult:
-        return self._create_result(self._compile(f"^{self.regex}").match(string))
+        return self._create_result(self._match_start(string))
 
     def match_end(self, string: str) -> MatchResult:
-        return self._create_result(self._compile(f"{self.regex}$").search(string))
+        return self._create_result(self._match_end(string))
 
     def search(self, string: str) -> MatchResult:
-        return self._create_result(self._compile(self.regex).search(string))
+        return self._create_result(self._search(string))
 
-    def search_all(self, string: str) -> MatchResultList:
-        compiled = self._compile(self.regex)
-        return MatchResultList(self._create_result(match_obj) for match_obj in compiled.finditer(string))
+    def is_match(self, string: str) -> bool:
+        """ Like bool(match()), but skips creating the result and converting the values. """
+        return self._match(string) is not None
 
-    def _create_result(self, single_match):
+    def search_all(self, string: str) -> MatchResultList:
+        return MatchResultList(self.iter_search_all(string))
+
+    def iter_search_all(self, string: str) -> Iterator[MatchResult]:
+        """ Like search_all(), but returns the results lazily, one at a time. """
+        return map(self._create_result, self._finditer(string))
+
+    # The underscored versions return the re.Match, or None if there was no match
+
+    def _match(self, string: str):
+        if self._literal is not None and string != self._literal:
+            return None
+        if self._required_in_match is not None and self._required_in_match not in string:
+            return None
+        return self._compiled_fullmatch(string)
+
+    def _match_start(self, string: str):
+        if self._literal is not None and not string.startswith(self._literal):
+            return None
+        if self._required_in_match is not None and self._required_in_match not in string:
+            return None
+        return self._compiled_match(string)  # match() is anchored at the start already
+
+    def _match_end(self, string: str):
+        if self._required is not None and self._required not in string:
+            return None
+        # A literal that ends with a newline may also match just before the final newline, further left
+        if self._literal is not None and not self._literal.endswith("\n"):
+            if string.endswith(self._literal):
+                return self._compiled_match(string, len(string) - len(self._literal))
+            if not string.endswith("\n"):  # $ also matches before a trailing newline
+                return None
+        return self._compiled_end.search(string)
+
+    def _search(self, string: str):
+        if self._literal is not None:
+            position = string.find(self._literal)
+            return self._compiled_match(string, position) if position != -1 else None
+        if self._required is not None and self._required not in string:
+            return None
+        return self._compiled_search(string)
+
+    def _finditer(self, string: str):
+        if self._literal is not None:
+            return self._find_literal(string)
+        if self._required is not None and self._required not in string:
+            return iter(())
+        return self._compiled.finditer(string)
+
+    def _find_literal(self, string: str):
+        literal = self._literal
+        match = self._compiled_match
+        position = string.find(literal)
+        while position != -1:
+            yield match(string, position)
+            position = string.find(literal, position + len(literal))
+
+    def _create_result(self, single_match) -> MatchResult:
         if not single_match:
+            return MatchResult._no_match()
+
+        if not self._has_groups:
             result = MatchResult()
             result.unnamed = []
-            result._matches = []
-            return result
-
         else:
-            result_dict = {
-                key: value
-                for key, value in single_match.groupdict().items()
-                if value is not None
-            }
-            result = MatchResult(result_dict)
-            result.unnamed = self._grouplist(single_match)
-            result._matches = [single_match]
-            for key, converter in self.converters.items():
-                if type(key) is int:
-                    raw_value = result.unnamed[key]
-                    result.unnamed[key] = raw_value and converter(raw_value)
-                else:
-                    result[key] = converter(result[key])
-
-            return result
-
-    def _create_regex(self):
-        pattern = self.pattern
-        self.converters.clear()  # empty converters
-        self._unnamed_group_index = 0
-        wildcards = {
-            "*": r".*",
-            "+": r".",
-            "?": r".?",
-            "|": r"|",  # Not converted but can be escaped
-        }
-
-        result = pattern.translate(SPECIAL_CHARS)  # escape special chars
-
-        for wildcard, actual in wildcards.items():
-            not_escaped_pattern = fr"(?<!\[)\{wildcard}"
-            escaped_pattern = fr"\[\{wildcard}]"
-            result = re.sub(not_escaped_pattern, actual, result)
-            result = re.sub(escaped_pattern, fr"\{wildcard}", result)
-
-        result = re.sub(r"(?<!\[)\[([^]]*)]", self._field_repl, result)  # handle groups
-
-        result = re.sub(r"\[\[", r"\[", result)
-        result = re.sub(r"]]", r"]", result)
-        if self.flexible_spaces:
-            result = re.sub(" ", " +", result)
-
+            result = MatchResult(self._named_groups(single_match))
+            result.unnamed = self._unnamed_groups(single_match)
+        result._matches = [single_match]
         return result
 
-    def _field_repl(self, match_obj):
-        group_string = match_obj.group(0).replace("\ ", "")
-        name_regex = r"(\w+)"
-        width_regex = r"(\d+)"
-
-        # unnamed field, just increase the index
-        match = re.search(r"\[]", group_string)
-        if match:
-            self._unnamed_group_index += 1
-            return r"(.*)"
-
-        # unnamed field with only width specifier
-        match = re.search(fr"\[:{width_regex}]", group_string)
-        if match:
-            width = match.group(1)
-            self._unnamed_group_index += 1
-            return fr"(.{{{width}}})"
-
-        # unnamed field with only the type annotation
-        match = re.search(fr"\[:{name_regex}]", group_string)
-        if match:
-            type_ = match.groups()[0]
-            # register this field with the name of the type to convert it later
-            type_spec = registered_types.get(type_)
-            if type_spec:
-                self.converters[self._unnamed_group_index] = type_spec.converter
-                self._unnamed_group_index += 1
-                return fr"({type_spec.regex})"
-            else:
-                raise ValueError(
-                    f"Unknown type {type_} - known types are: {','.join(registered_types.keys()) or 'None found'}"
-                )
-
-        # named field without type annotation
-        match = re.search(fr"\[{name_regex}]", group_string)
-        if match:
-            name = match.group(1)
-            return fr"(?P<{name}>.*)"
-
-        # named field with width specifier
-        match = re.search(fr"\[{name_regex}:{width_regex}]", group_string)
-        if match:
-            name, width = match.groups()
-            return fr"(?P<{name}>.{{{width}}})"
-
-        # named field with type annotation
-        match = re.search(fr"\[{name_regex}:{name_regex}]", group_string)
-        if match:
-            name, type_ = match.groups()
-            # register this field to convert it later
-            type_spec = registered_types.get(type_)
-            if type_spec:
-                self.converters[name] = type_spec.converter
-                return fr"(?P<{name}>{type_spec.regex})"
-            else:
-                raise ValueError(
-                    f"Unknown type {type_} - known types are: {','.join(registered_types.keys()) or 'None found'}"
-                )
-
-    @staticmethod
-    def _grouplist(match) -> list:
-        """ Return unnamed match groups as a list. """
-        # https://stackoverflow.com/a/53385788/300783
-        named = match.groupdict()
-
-        ignored_groups = {
-            index - 1
-            for name, index in match.re.groupindex.items()
-            if name is None or name in named}
-
-        return [group for i, group in enumerate(match.groups()) if i not in ignored_groups]
+    def _apply_match(self, single_match, result: MatchResult):
+        """ Add the groups of a successful match to an existing result. """
+        if self._has_groups:
+            result.update(self._named_groups(single_match))
+            result.unnamed.extend(self._unnamed_groups(single_match))
+        result._matches.append(single_match)
+
+    def _named_groups(self, single_match) -> dict:
+        named = single_match.groupdict()
+        if self._named_always_participate:
+            for name, converter in self._named_converters:
+                named[name] = converter(named[name])
+            return named
+
+        named = {key: value for key, value in named.items() if value is not None}
+        for name, converter in self._named_converters:
+            if name in named:  # Groups that did not take part in the match are left out
+                named[name] = converter(named[name])
+        return named
+
+    def _unnamed_groups(self, single_match) -> list:
+        positions = self._unnamed_positions
+        if not positions:
+            return []
+        groups = single_match.groups()
+        unnamed = list(groups) if len(positions) == len(groups) else [groups[position] for position in positions]
+        for index, converter in self._unnamed_converters:
+            raw_value = unnamed[index]
+            unnamed[index] = raw_value and converter(raw_value)
+        return unnamed
+
+    def __reduce__(self):
+        # Pickled and copied by the options only, the compiled state is rebuilt (and shared) on the other side
+        return type(self), (self.pattern, self.case_sensitive, self.flexible_spaces, self.engine)
 
     def __repr__(self):
         return f'<Matcher("{self.pattern}")>'
 
 
 class MultiMatcher:
-    def __init__(self, patterns, case_sensitive: bool = True, flexible_spaces=True, strict: bool = False):
+    def __init__(
+        self, patterns, case_sensitive: bool = True, flexible_spaces=True, strict: bool = False, engine: str = "re"
+    ):
         """
         patterns: One of more qre patterns, all of which are matched/searched and results collected into one result
         case_sensitive: Whether case is considered when matching, default True.
         strict: Whether all patterns must match for the overall result to be a match. Default is False, partials are ok.
+        engine: Regex engine used by all the patterns, "re" (default), "re2" or "auto".
         """
         self.matchers = [
-            Matcher(pattern, case_sensitive=case_sensitive, flexible_spaces=flexible_spaces) for pattern in patterns
+            Matcher(pattern, case_sensitive=case_sensitive, flexible_spaces=flexible_spaces, engine=engine)
+            for pattern in patterns
         ]
         self.strict = strict
+        # Cheapest first, for checks where the order of the results does not matter
+        self._by_cost = sorted(self.matchers, key=lambda matcher: (matcher._literal is None, len(matcher.pattern)))
 
     @staticmethod
-    def _matcher(property_name):
+    def _matcher(method_name):
         def collect_results(self, string):
-            result = getattr(self.matchers[0], property_name)(string)
-            if not bool(result) and self.strict:
-                return result
-            for matcher in self.matchers[1:]:
-                if bool(sub_result := getattr(matcher, property_name)(string)):
-                    result.update(sub_result)
-                    result.unnamed.extend(sub_result.unnamed)
-                    result._matches.extend(sub_result._matches)
+            result = MatchResult._no_match()
+            for matcher in self.matchers:
+                if single_match := getattr(matcher, method_name)(string):
+                    matcher._apply_match(single_match, result)
                 elif self.strict:
-                    return sub_result
+                    return MatchResult._no_match()
             return result
         return collect_results
 
-    match = _matcher("match")
-    match_start = _matcher("match_start")
-    match_end = _matcher("match_end")
-    search = _matcher("search")
-    search_all = _matcher("search_all")
+    match = _matcher("_match")
+    match_start = _matcher("_match_start")
+    match_end = _matcher("_match_end")
+    search = _matcher("_search")
+
+    def any_match(self, string: str) -> bool:
+        """ Whether any of the patterns can be found in the string. Stops at the first one found. """
+        return any(matcher._search(string) for matcher in self._by_cost)
+
+    def search_all(self, string: str) -> MatchResultList:
+        """ Results of all the patterns, in pattern order. """
+        results = MatchResultList()
+        for matcher in self.matchers:
+            if sub_results := matcher.search_all(string):
+                results.extend(sub_results)
+            elif self.strict:
+                return MatchResultList()
+        return results
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_matcher(pattern, case_sensitive, flexible_spaces):
+    return Matcher(pattern, case_sensitive=case_sensitive, flexible_spaces=flexible_spaces)
+
+
+def clear_cache():
+    """ Clear the caches of translated and compiled patterns and of Matchers used by the module-level functions. """
+    _translate.cache_clear()
+    _prepare.cache_clear()
+    _get_matcher.cache_clear()
+
+
+@functools.wraps(_register_type)
+def register_type(*args, **kwargs):
+    _register_type(*args, **kwargs)
+    clear_cache()  # Cached patterns may have been translated with a previous definition of the type
 
 
-def match(pattern, string, case_sensitive=True):
-    return Matcher(pattern, case_sensitive=case_sensitive).match(string)
+def match(pattern, string, case_sensitive=True, flexible_spaces=True):
+    return _get_matcher(pattern, case_sensitive, flexible_spaces).match(string)
 
 
-def match_start(pattern, string, case_sensitive=True):
-    return Matcher(pattern, case_sensitive=case_sensitive).match_start(string)
+def match_start(pattern, string, case_sensitive=True, flexible_spaces=True):
+    return _get_matcher(pattern, case_sensitive, flexible_spaces).match_start(string)
 
 
-def match_end(pattern, string, case_sensitive=True):
-    return Matcher(pattern, case_sensitive=case_sensitive).match_end(string)
+def match_end(pattern, string, case_sensitive=True, flexible_spaces=True):
+    return _get_matcher(pattern, case_sensitive, flexible_spaces).match_end(string)
 
 
-def search(pattern, string, case_sensitive=True):
-    return Matcher(pattern, case_sensitive=case_sensitive).search(string)
+def search(pattern, string, case_sensitive=True, flexible_spaces=True):
+    return _get_matcher(pattern, case_sensitive, flexible_spaces).search(string)
 
 
-def search_all(pattern, string, case_sensitive=True):
-    return Matcher(pattern, case_sensitive=case_sensitive).search_all(string)
+def search_all(pattern, string, case_sensitive=True, flexible_spaces=True):
+    return _get_matcher(pattern, case_sensitive, flexible_spaces).search_all(string)
 
 
-def to_regex(pattern):
-    return Matcher(pattern).regex
+def to_regex(pattern, flexible_spaces=True):
+    return _get_matcher(pattern, True, flexible_spaces).regex
 
 
 if __name__ == "__main__":
@@ -407,7 +824,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
     matcher = Matcher(args.pattern)
     result = matcher.match(args.string)
-    if matcher:
+    if result:
         print(json.dumps(result))
         if result.unnamed:
             print("Unnamed groups:", result.unnamed)
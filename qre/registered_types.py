@@ -5,6 +5,7 @@ import re
 import uuid
 from collections.abc import Callable
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
 
 
@@ -15,6 +16,14 @@ registered_types = {}
 class Conversion:
     regex: str
     converter: Callable
+    # Group fragments ready to be used in generated patterns
+    unnamed_group: str = field(init=False, repr=False)
+    named_template: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.unnamed_group = f"({self.regex})"
+        escaped_regex = self.regex.replace("{", "{{").replace("}", "}}")  # Regex quantifiers vs. str.format
+        self.named_template = f"(?P<{{name}}>{escaped_regex})"
 
 
 # A regex that ensures all groups to be non-capturing, so that they do not appear in the matches.
@@ -25,7 +34,7 @@ def register_type(
     name: str,
     regex: str,
     converter: Callable[[str], Any] = str,
-    cleanup_regex=re.compile(r"(?<!\\)\((?!\?)")
+    cleanup_regex=TYPE_CLEANUP_REGEX,
 ):
     """
     Register a type to be available for the {value:type} matching syntax.
@@ -33,23 +42,66 @@ def register_type(
     By default, returns the matched string as is, but can be provided with a callable that takes a string and
     converts the result to some more appropriate type (e.g. Decimal).
     """
-    cleaned = cleanup_regex.sub("(?:", regex)
+    cleaned = cleanup_regex.sub("(?:", regex) if "(" in regex else regex  # Only groups need cleaning up
     registered_types[name] = Conversion(regex=cleaned, converter=converter)
 
 
+def _to_uuid(value: str) -> uuid.UUID:
+    # The regex has already checked the format, so skip the string parsing in UUID
+    return uuid.UUID(int=int(value.replace("-", ""), 16))
+
+
+def _to_date(value: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:  # fromisoformat does not accept single-digit months and days
+        return datetime.date(*map(int, value.split("-")))
+
+
+# Parts of the datetime type, for the strings that datetime.fromisoformat does not accept.
+# Case-insensitive, as case_sensitive=False patterns also let a lowercase t and z through.
+DATETIME_PARTS_REGEX = re.compile(
+    r"(\d{4})-(\d{1,2})-(\d{1,2})[T ](\d{1,2}):(\d{1,2})(?::(\d{1,2})(?:[\.,](\d+))?)?(Z|[+-]\d{2}(?::?\d{2})?)?",
+    re.IGNORECASE,
+)
+
+
+def _to_datetime(value: str) -> datetime.datetime:
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:  # Single-digit fields, and before Python 3.11 also Z, commas and other offset formats
+        pass
+
+    parts = DATETIME_PARTS_REGEX.fullmatch(value)
+    if not parts:
+        raise ValueError(f"Invalid datetime {value}")
+    year, month, day, hour, minute, second, fraction, offset = parts.groups()
+    microsecond = int(fraction[:6].ljust(6, "0")) if fraction else 0
+    if not offset:
+        tzinfo = None
+    elif offset.upper() == "Z":
+        tzinfo = datetime.timezone.utc
+    else:
+        minutes = int(offset[1:3]) * 60 + (int(offset[-2:]) if len(offset) > 3 else 0)
+        tzinfo = datetime.timezone(datetime.timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+    return datetime.datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second or 0), microsecond, tzinfo
+    )
+
+
 # include some useful conversions
 register_type("int", r"[+-]?[0-9]+", int)
 register_type("float", r"[+-]?([0-9]*[.])?[0-9]+", float)
 register_type("decimal", r"[+-]?([0-9]*[.])?[0-9]+", decimal.Decimal)
-register_type("uuid", r"[a-f0-9]{8}-?[a-f0-9]{4}-?[a-f0-9]{4}-?[a-f0-9]{4}-?[a-f0-9]{12}", uuid.UUID)
-register_type("date", r"\d{4}-\d{1,2}-\d{1,2}", datetime.date.fromisoformat)
+register_type("uuid", r"[a-f0-9]{8}-?[a-f0-9]{4}-?[a-f0-9]{4}-?[a-f0-9]{4}-?[a-f0-9]{12}", _to_uuid)
+register_type("date", r"\d{4}-\d{1,2}-\d{1,2}", _to_date)
 register_type(
     "datetime",
     r"\d{4}-\d{1,2}-\d{1,2}"
     r"[T ]\d{1,2}:\d{1,2}"
     r"(?::\d{1,2}(?:[\.,]\d{1,6}\d{0,6})?)?"
     r"(Z|[+-]\d{2}(?::?\d{2})?)?",
-    datetime.datetime.fromisoformat
+    _to_datetime,
 )
 
 # Basic patters
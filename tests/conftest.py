@@ -1,11 +1,14 @@
-import importlib
-
 import pytest
 
 import qre
+from qre.registered_types import registered_types
+
+BASELINE_TYPES = dict(registered_types)
 
 
 @pytest.fixture(autouse=True)
 def reset_registered_types():
     """Ensure global registered_types is reset to baseline before every test."""
-    importlib.reload(qre)
+    registered_types.clear()
+    registered_types.update(BASELINE_TYPES)
+    qre.clear_cache()
@@ -1,9 +1,15 @@
+import copy
 import datetime
+import io
+import pickle
+import re
 
 import pytest
 
+import qre as qre_module
 from qre import MatchResult
 from qre import qre
+from qre import register_type
 
 def test_readme_example_opener():
     assert qre("He* [planet]!").match("Hello World!") == {"planet": "World"}
@@ -59,6 +65,135 @@ def test_functions(matcher, string, is_match):
     assert bool(getattr(qre(pattern), matcher)(string)) == is_match
 
 
+@pytest.mark.parametrize(
+    "function, string, is_match",
+    (
+        ("match", "hit", True),
+        ("match", "hit miss", False),
+        ("match_start", "hit miss", True),
+        ("match_end", "miss hit", True),
+        ("search", "miss hit miss", True),
+        ("search_all", "hit miss hit", True),
+    )
+)
+def test_module_level_functions(function, string, is_match):
+    assert bool(getattr(qre_module, function)("hit", string)) == is_match
+
+
+def test_module_level_functions_options():
+    assert qre_module.match("hello [place]", "Hello   World", case_sensitive=False)
+    assert not qre_module.match("hello [place:letters]", "hello   World", flexible_spaces=False)
+
+
+def test_module_level_functions_reuse_matchers(monkeypatch):
+    created = []
+
+    class CountingMatcher(qre_module.Matcher):
+        def __init__(self, *args, **kwargs):
+            created.append(args)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(qre_module, "Matcher", CountingMatcher)
+    qre_module.clear_cache()
+    assert qre_module.match("[value:int]", "1") == {"value": 1}
+    assert qre_module.search("[value:int]", "a 1") == {"value": 1}
+    assert len(created) == 1
+
+
+def test_matchers_share_translated_patterns(monkeypatch):
+    looked_up = []
+
+    class CountingTypes(dict):
+        def __getitem__(self, name):
+            looked_up.append(name)
+            return super().__getitem__(name)
+
+    monkeypatch.setattr(qre_module, "registered_types", CountingTypes(qre_module.registered_types))
+    qre_module.clear_cache()
+    first = qre("[value:int] *")
+    second = qre("[value:int] *", case_sensitive=False)
+    assert looked_up == ["int"]  # Translated once, for both Matchers
+    assert first.regex == second.regex
+    assert first.converters == second.converters == {"value": int}
+
+
+def test_matchers_share_compiled_patterns(monkeypatch):
+    first = qre("[value:int] *")
+    compiled = []
+    original_compile = re.compile
+    monkeypatch.setattr(re, "compile", lambda *args: compiled.append(args) or original_compile(*args))
+    second = qre("[value:int] *")
+    assert compiled == []  # Reused from the first Matcher
+    assert first.converters is second.converters
+    with pytest.raises(TypeError):
+        first.converters["value"] = float
+    second.pattern = "[value:float] *"
+    assert first.match("1 item") == {"value": 1}
+    assert second.match("1.5 items") == {"value": 1.5}
+
+
+def test_register_type_invalidates_cached_matchers():
+    register_type("digits", r"[0-9]+")
+    assert qre_module.match("[value:digits]", "12") == {"value": "12"}
+
+    register_type("digits", r"[0-9]+", int)
+    assert qre_module.match("[value:digits]", "12") == {"value": 12}
+
+
+def test_literal_patterns():
+    matcher = qre("a.(b)")
+    assert matcher.match("a.(b)")
+    assert not matcher.match("ax(b)")
+    assert matcher.match_start("a.(b) and more")
+    assert not matcher.match_start("more a.(b)")
+    assert matcher.match_end("more and a.(b)")
+    assert matcher.match_end("more and a.(b)\n")
+    assert not matcher.match_end("a.(b) and more")
+    assert qre("\n").match_end("a\n\n")._matches[0].span() == (1, 2)
+    assert matcher.search("find a.(b) here")._matches[0].span() == (5, 10)
+    assert len(matcher.search_all("a.(b)a.(b) a.(b)")) == 3
+    assert not matcher.search_all("nothing here")
+
+
+@pytest.mark.parametrize(
+    "pattern, string, without_literal",
+    (
+        ("* pattern", "a pattern", "a patter"),
+        ("[[x]] [a] * b[*]c", "[x] y z b*c", "[y] y z b*c"),
+        ("[] [:int] items", "three 3 items", "three 3 item"),
+        ("a*|bcd", "bcd", None),  # No literal is required with alternatives
+        ("[anything]", "text", None),
+    ),
+)
+def test_required_literal(pattern, string, without_literal):
+    matcher = qre(pattern)
+    assert matcher.match(string)
+    assert matcher.match_end(f"before {string}")
+    assert matcher.search(f"before {string}")
+    assert matcher.search_all(f"before {string}")
+    if without_literal is not None:
+        assert not matcher.match(without_literal)
+        assert not matcher.match_end(without_literal)
+        assert not matcher.search(without_literal)
+        assert not matcher.search_all(without_literal)
+
+
+def test_is_match():
+    matcher = qre("[url:url]")
+    assert matcher.is_match("https://www.site.com/home")
+    assert not matcher.is_match("no url here")
+    assert not qre("[:int]").is_match("1 too many")
+
+
+def test_required_literal_prefilter():
+    matcher = qre("* pattern [value:int]")
+    assert not matcher.search("lorem ipsum " * 100)
+    assert not matcher.search_all("lorem ipsum " * 100)
+    assert matcher.match("a pattern 1") == {"value": 1}
+    assert matcher.match_end("this pattern 2") == {"value": 2}
+    assert qre("* PATTERN", case_sensitive=False).match("a pattern")
+
+
 def test_search_all():
     assert qre("nugget").search_all("There is a nugget of information")
 
@@ -122,6 +257,23 @@ def test_match_patterns(pattern, string, result):
     assert bool(qre(pattern).match(string)) == result
 
 
+def test_unknown_type_raises():
+    with pytest.raises(ValueError, match="Unknown type nosuchtype"):
+        qre("[value:nosuchtype]")
+
+
+def test_literal_brackets_are_not_groups():
+    result = qre("[[brackets]]").match("[brackets]")
+    assert result == {}
+    assert result.unnamed == []
+    assert result
+
+
+def test_invalid_group_raises():
+    with pytest.raises(ValueError):
+        qre("[not-a-name]")
+
+
 @pytest.mark.parametrize(
     "pattern, string, test_result, match_result",
     (
@@ -198,6 +350,31 @@ def test_mixed_groups_with_hints():
     assert list(result.all_items()) == [(None, 2), ("one", 1)]
 
 
+def test_typed_groups_in_alternatives():
+    matcher = qre("[number:int]|[word:letters]")
+    assert matcher.match("1") == {"number": 1}
+    assert matcher.match("one") == {"word": "one"}
+
+
+def test_optional_named_group_in_registered_type():
+    register_type("opt", r"(?P<inner>a)?b")
+    assert qre("[x:opt]").match("b") == {"x": "b"}
+    assert qre("[x:opt]").match("ab") == {"x": "ab", "inner": "a"}
+
+
+def test_iter_search_all():
+    results = qre("[word:letters]").iter_search_all("Many hits here")
+    assert next(results) == {"word": "Many"}
+    assert list(results) == [{"word": "hits"}, {"word": "here"}]
+    assert list(qre("nugget").iter_search_all("a nugget and a nugget")) == [{}, {}]
+
+
+def test_search_all_values_and_items():
+    results = qre("[key:letters]=[:int]").search_all("a=1, b=2")
+    assert list(results.all_values()) == [1, "a", 2, "b"]
+    assert list(results.all_items()) == [(None, 1), ("key", "a"), (None, 2), ("key", "b")]
+
+
 def test_case_sensitive():
     assert qre("Hello []").match("Hello World")
     assert not qre("hello []").match("Hello World")
@@ -211,6 +388,68 @@ def test_case_sensitive():
     }
 
 
+def test_changing_options_rebuilds_regex():
+    matcher = qre("hello [place]")
+    assert not matcher.match("Hello World")
+
+    matcher.case_sensitive = False
+    assert matcher.match("Hello World") == {"place": "World"}
+
+    matcher.pattern = "goodbye [place]"
+    assert matcher.match("Goodbye World") == {"place": "World"}
+    assert not matcher.match("Hello World")
+
+
+def test_pickle_and_copy():
+    matcher = pickle.loads(pickle.dumps(qre("[a:int] b", case_sensitive=False)))
+    assert matcher.match("1 B") == {"a": 1}
+    assert copy.deepcopy(matcher).match("2 b") == {"a": 2}
+    multi_matcher = pickle.loads(pickle.dumps(qre("[a:int]", "[b:float]")))
+    assert multi_matcher.search("1.5") == {"a": 1, "b": 1.5}
+
+
+def test_invalid_option_leaves_matcher_unchanged():
+    matcher = qre("[a:int]")
+    with pytest.raises(ValueError):
+        matcher.pattern = "[a:nosuch]"
+    with pytest.raises(ValueError):
+        matcher.engine = "bogus"
+    assert matcher.pattern == "[a:int]"
+    assert matcher.engine == "re"
+    assert matcher.match("5") == {"a": 5}
+
+
+def test_re2_engine():
+    pytest.importorskip("re2")
+    matcher = qre("key [key:identifier], value [value:int]", case_sensitive=False, engine="re2")
+    assert matcher.match("Key a1, VALUE 2") == {"key": "a1", "value": 2}
+    assert [result.unnamed for result in qre("[:int]", engine="re2").search_all("1 2")] == [[1], [2]]
+    assert qre("[a] and [b]", engine="re2").match("this and that").replace({"b": "those"}) == "this and those"
+
+
+def test_auto_engine():
+    pytest.importorskip("re2")
+    assert not isinstance(qre("[:int]", engine="auto")._compiled, re.Pattern)
+    register_type("prefixed", r"(?<=#)\d+", int)
+    matcher = qre("#[value:prefixed]", engine="auto")
+    assert isinstance(matcher._compiled, re.Pattern)
+    assert matcher.match("#12") == {"value": 12}
+
+
+def test_auto_engine_falls_back_quietly(capfd):
+    pytest.importorskip("re2")
+    register_type("commented", r"\d+(?#digits)", int)  # Comment groups are not supported by RE2
+    matcher = qre("[value:commented]", engine="auto")
+    assert isinstance(matcher._compiled, re.Pattern)
+    assert matcher.match("12") == {"value": 12}
+    assert capfd.readouterr().err == ""
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError, match="Unknown engine"):
+        qre("*", engine="nosuchengine")
+
+
 def test_patterns_search():
     matcher = qre("One", "Three")
     assert not matcher.search("Two")
@@ -218,6 +457,13 @@ def test_patterns_search():
     assert matcher.search("One Two Three")
 
 
+def test_patterns_any_match():
+    matcher = qre("Value [value:int]", "One", "Three")
+    assert matcher.any_match("Two Three")
+    assert matcher.any_match("Value 1")
+    assert not matcher.any_match("Two")
+
+
 def test_patterns_search_strict():
     matcher = qre("One", "Three", strict=True)
     assert not matcher.search("Two")
@@ -249,6 +495,12 @@ def test_patterns_search__unnamed__strict():
     assert matcher.search("Key A, Value 1").unnamed == ["A", 1]
 
 
+def test_patterns_search_all():
+    matcher = qre("[key:letters]=", "=[value:int]")
+    assert matcher.search_all("a=1, b=2") == [{"key": "a"}, {"key": "b"}, {"value": 1}, {"value": 2}]
+    assert qre("[key:letters]=", "#", strict=True).search_all("a=1, b=2") == []
+
+
 def test_patterns_overlapping_group_names():
     matcher = qre("[value:int]", "[value:letters]")
     assert matcher.match("1") == {"value": 1}
@@ -274,6 +526,14 @@ def test_replace_unnamed_groups():
     assert qre(pattern).match(string).replace(replacements) == "some types of patterns"
 
 
+def test_replace_with_list_subclass():
+    class Replacements(list):
+        pass
+
+    replacements = Replacements(["some", "pattern"])
+    assert qre("[] types of []s").match("all types of marshmallows").replace(replacements) == "some types of patterns"
+
+
 def test_replace_named_groups():
     string = "all types of marshmallows"
     pattern = "[qualifier] types of [object]s"
@@ -281,6 +541,12 @@ def test_replace_named_groups():
     assert qre(pattern).match(string).replace(replacements) == "some types of patterns"
 
 
+def test_replace_groups_by_number():
+    result = qre("[] and [b]").match("x and y")
+    assert result.replace({1: "X", "b": "Y"}) == "X and Y"
+    assert result.replace({3: "ignored", "b": "Y"}) == "x and Y"
+
+
 def test_replace_unnamed_groups_multiple_match_patterns():
     string = "1 email: test@test.tst"
     patterns = "[:int]", "email[]:", "[:email]"
@@ -302,3 +568,20 @@ def test_replace_multiple_search_hits():
     assert qre(pattern).search_all(string).replace(1, 2) == "1 2 C"
     assert qre(pattern).search_all(string).replace([1, 2, 3]) == "1 2 3"
     assert qre(pattern).search_all(string).replace(1, 2, 3, 4) == "1 2 3"
+
+
+def test_replace_multiple_search_hits_with_longer_values():
+    assert qre("[:letters]").search_all("A B C").replace("one", "two") == "one two C"
+
+
+def test_replace_multiple_patterns_search_all():
+    results = qre("a[x:int]", "b[y:int]").search_all("b1 a2 b3")
+    assert results.replace("X", "Y", "Z") == "bY aX bZ"
+
+
+def test_replace_into():
+    buffer = io.StringIO()
+    qre("[qualifier] types of [object]s").match("all types of marshmallows").replace_into(
+        buffer, {"object": "pattern", "qualifier": "some"}
+    )
+    assert buffer.getvalue() == "some types of patterns"
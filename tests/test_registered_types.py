@@ -65,6 +65,7 @@ def test_type_uuid(string, result):
 
 def test_type_date():
     assert qre("[date:date]").match("2022-09-16") == {"date": datetime.date(2022, 9, 16)}
+    assert qre("[date:date]").match("2022-9-6") == {"date": datetime.date(2022, 9, 6)}
 
 
 def test_type_datetime__naive():
@@ -82,6 +83,31 @@ def test_type_datetime__with_timezone():
     assert as_datetime.tzinfo == datetime.timezone(datetime.timedelta(seconds=7200))
 
 
+@pytest.mark.parametrize(
+    "string, case_sensitive, result",
+    (
+        ("2007-1-2 3:04", True, datetime.datetime(2007, 1, 2, 3, 4)),
+        ("2007-11-20T22:19:17,5Z", True, datetime.datetime(2007, 11, 20, 22, 19, 17, 500000, datetime.timezone.utc)),
+        (
+            "2007-11-20 22:19:17.1234567-0130",
+            True,
+            datetime.datetime(
+                2007, 11, 20, 22, 19, 17, 123456, datetime.timezone(-datetime.timedelta(hours=1, minutes=30))
+            ),
+        ),
+        (
+            "2007-11-20 22:19+02",
+            True,
+            datetime.datetime(2007, 11, 20, 22, 19, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        ),
+        ("2007-11-20T22:19:17z", False, datetime.datetime(2007, 11, 20, 22, 19, 17, tzinfo=datetime.timezone.utc)),
+        ("2007-1-20t22:19:17", False, datetime.datetime(2007, 1, 20, 22, 19, 17)),
+    ),
+)
+def test_type_datetime__other_formats(string, case_sensitive, result):
+    assert qre("[datetime:datetime]", case_sensitive=case_sensitive).match(string) == {"datetime": result}
+
+
 @pytest.mark.parametrize(
     "string, result",
     (